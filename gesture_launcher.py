@@ -2,10 +2,13 @@
 gesture_launcher.py
 
 Requirements:
-    pip install opencv-python mediapipe
+    pip install opencv-python "mediapipe>=0.10" numpy
+    Hand landmarker model (save next to this script as hand_landmarker.task):
+    https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task
 
 Optional:
     pip install pyttsx3   # for voice feedback
+    pip install numba     # JIT-compiled finger counting
 
 Usage:
     python gesture_launcher.py
@@ -18,21 +21,32 @@ Customize:
 
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
 import webbrowser
 import subprocess
 import sys
 import os
 import shutil
+import queue
+import threading
+import functools
+import concurrent.futures
 
-# Optional voice feedback
+# Optional voice feedback (the engine itself is created on the TTS worker thread)
 try:
     import pyttsx3
     VOICE_AVAILABLE = True
-    tts_engine = pyttsx3.init()
 except Exception:
     VOICE_AVAILABLE = False
 
+# Optional JIT for the per-frame finger classifier
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+
 # ------------------------
 # Configuration
 # ------------------------
@@ -42,12 +56,62 @@ STABLE_FRAMES = 6
 
 # After triggering, wait this many seconds before allowing the next trigger
 COOLDOWN_SECONDS = 3.0
+COOLDOWN_NS = int(COOLDOWN_SECONDS * 1e9)  # cooldown is tracked with time.perf_counter_ns()
+
+# MediaPipe Tasks hand landmarker model bundle
+HAND_LANDMARKER_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hand_landmarker.task")
+
+# Run the hand landmarker on the GPU where supported (falls back to CPU)
+USE_GPU = True
+
+# Draw and show only every Nth processed frame. Gesture detection still runs on all of them.
+DISPLAY_EVERY = 2
 
 # Webcam index (0 is usually default)
 WEBCAM_INDEX = 0
 
+# Capture settings requested from the driver. A 1-frame buffer means cap.read()
+# always returns the most recent frame instead of a stale backlog.
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+CAPTURE_FPS = 30
+CAPTURE_BUFFER_SIZE = 1
+
+# Width of the copy handed to MediaPipe; its height follows the camera's real
+# aspect ratio so hands aren't squashed. Landmarks come back normalized to [0,1],
+# so they can be drawn straight onto the full-resolution frame.
+INFERENCE_WIDTH = 320
+
+# Max frames buffered between pipeline stages (capture -> inference -> display).
+# Small values keep latency low; the producer drops to waiting when a queue is full.
+PIPELINE_QUEUE_SIZE = 2
+
+# Max frames submitted to MediaPipe that haven't had a result yet. When full, the
+# oldest is forgotten (LIVE_STREAM may drop frames without ever calling back).
+MAX_IN_FLIGHT = 2
+
+# Seconds a pipeline stage waits on a queue before re-checking for shutdown
+PIPELINE_TIMEOUT = 0.1
+
+# Max hands MediaPipe tracks. With more than one, the first detected hand drives actions.
+MAX_NUM_HANDS = 1
+
+# Landmark pairs joined when drawing a hand (MediaPipe hand topology)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),          # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # index
+    (5, 9), (9, 10), (10, 11), (11, 12),     # middle
+    (9, 13), (13, 14), (14, 15), (15, 16),   # ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky + palm
+)
+
 # Finger tip landmark indices (MediaPipe hand landmark indices)
 FINGER_TIPS = [4, 8, 12, 16, 20]  # thumb, index, middle, ring, pinky
+NUM_LANDMARKS = 21
+
+# Tip / PIP joint indices for the four non-thumb fingers (pip is two indices before tip)
+_FINGER_TIP_IDX = np.array(FINGER_TIPS[1:])
+_FINGER_PIP_IDX = _FINGER_TIP_IDX - 2
 
 # Map finger_count -> action lambda / function / tuple.
 # Provide simple actions: "open_url", "open_program", "say_text", "noop"
@@ -81,19 +145,67 @@ PROGRAM_LOOKUP = {
     }
 }
 
+# Max pending voice messages; further ones are dropped until speech catches up
+TTS_QUEUE_SIZE = 2
+
+# finger_count -> command list for "open_program" entries, filled at startup
+# by resolve_mapped_programs()
+RESOLVED_CMDS = {}
+
+# finger_count -> zero-arg callable that performs the mapped action (and voice
+# feedback), filled at startup by compile_actions(). "noop" entries and entries
+# without a parameter are absent.
+ACTIONS = {}
+
 # ------------------------
 # Utilities
 # ------------------------
 
+# Popen options for launched apps: own session, no inherited fds (e.g. the webcam)
+_DETACHED = dict(start_new_session=True, close_fds=True)
+
+def _tts_worker():
+    """
+    Speak queued messages one at a time, off the display thread.
+    The engine is created here because the SAPI5 (Windows) and NSSpeechSynthesizer
+    (macOS) drivers only work on the thread that created them.
+    """
+    try:
+        if sys.platform == "win32":
+            import comtypes
+            comtypes.CoInitialize()
+        tts_engine = pyttsx3.init()
+    except Exception as e:
+        print(f"[WARN] Voice feedback disabled, could not start TTS engine: {e}")
+        return
+    while True:
+        text = _tts_q.get()
+        try:
+            tts_engine.say(text)
+            tts_engine.runAndWait()
+        except Exception as e:
+            print(f"[WARN] Could not speak '{text}': {e}")
+
 def speak(text: str):
+    """Queue text for the TTS worker. Dropped if speech is already backed up."""
     if not VOICE_AVAILABLE:
         return
     try:
-        tts_engine.say(text)
-        tts_engine.runAndWait()
-    except Exception:
+        _tts_q.put_nowait(text)
+    except queue.Full:
         pass
 
+# runAndWait() blocks for the whole utterance, so speech runs on its own thread
+_tts_q = queue.Queue(maxsize=TTS_QUEUE_SIZE)
+if VOICE_AVAILABLE:
+    threading.Thread(target=_tts_worker, daemon=True).start()
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(name: str):
+    """shutil.which(), memoized so PATH is only searched once per name."""
+    return shutil.which(name)
+
+@functools.lru_cache(maxsize=None)
 def find_executable_for_key(key: str):
     """
     Given a PROGRAM_LOOKUP key, try to find a usable executable command.
@@ -109,7 +221,7 @@ def find_executable_for_key(key: str):
                 if os.path.isabs(c) and os.path.exists(c):
                     return c
                 # if on PATH
-                path = shutil.which(c)
+                path = _which_cached(c)
                 if path:
                     return path
     # fallback: search all candidates across platforms
@@ -117,7 +229,7 @@ def find_executable_for_key(key: str):
         for c in candidates:
             if os.path.isabs(c) and os.path.exists(c):
                 return c
-            path = shutil.which(c)
+            path = _which_cached(c)
             if path:
                 return path
     return None
@@ -128,16 +240,16 @@ def launch_program_by_key(key: str):
         try:
             # On macOS, if cmd is '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
             # just call it directly.
-            subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_DETACHED)
             return True
         except Exception as e:
             # fallback: try opening via system open
             try:
                 if sys.platform == "darwin":
-                    subprocess.Popen(["open", "-a", key])
+                    subprocess.Popen(["open", "-a", key], **_DETACHED)
                     return True
                 elif sys.platform.startswith("linux"):
-                    subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_DETACHED)
                     return True
             except Exception:
                 print(f"[WARN] Could not launch {key}: {e}")
@@ -146,6 +258,27 @@ def launch_program_by_key(key: str):
         print(f"[INFO] No executable found for '{key}'.")
         return False
 
+def resolve_program(param: str):
+    """
+    Resolve an "open_program" param (absolute path, executable name or
+    PROGRAM_LOOKUP key) to the executable to run. Returns None if not found.
+    """
+    if os.path.isabs(param) and os.path.exists(param):
+        return param
+    return _which_cached(param) or find_executable_for_key(param)
+
+def resolve_mapped_programs():
+    """
+    Fill RESOLVED_CMDS with the command for every "open_program" entry in
+    APP_MAPPING, so triggering an action doesn't have to search the filesystem.
+    """
+    RESOLVED_CMDS.clear()
+    for finger_count, (action, param) in APP_MAPPING.items():
+        if action == "open_program" and param:
+            cmd = resolve_program(param)
+            if cmd:
+                RESOLVED_CMDS[finger_count] = [cmd]
+
 def perform_mapped_action(mapping_tuple):
     """
     mapping_tuple is ("action_type", param)
@@ -164,17 +297,17 @@ def perform_mapped_action(mapping_tuple):
         # If param is a path or exe in PATH
         if os.path.isabs(param) and os.path.exists(param):
             try:
-                subprocess.Popen([param], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen([param], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_DETACHED)
                 return True
             except Exception as e:
                 print(f"[WARN] Couldn't launch {param}: {e}")
                 return False
         # Else treat param as key for PROGRAM_LOOKUP or executable name
         # Try direct 'which' first
-        exe = shutil.which(param)
+        exe = _which_cached(param)
         if exe:
             try:
-                subprocess.Popen([exe], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen([exe], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_DETACHED)
                 return True
             except Exception as e:
                 print(f"[WARN] Couldn't launch {exe}: {e}")
@@ -188,103 +321,457 @@ def perform_mapped_action(mapping_tuple):
     print(f"[WARN] Unknown action '{action}' or missing parameter.")
     return False
 
+def perform_and_announce(mapping_tuple):
+    """
+    perform_mapped_action() plus voice feedback. Runs on the action executor,
+    so a slow process launch never stalls the display loop.
+    """
+    acted = perform_mapped_action(mapping_tuple)
+    if acted:
+        # Optional voice feedback
+        if mapping_tuple[0] == "open_url":
+            speak(f"Opening website.")
+        elif mapping_tuple[0] == "open_program":
+            speak(f"Opening program.")
+        elif mapping_tuple[0] == "say_text":
+            speak(mapping_tuple[1])
+        else:
+            # Generic
+            speak("Action performed.")
+    return acted
+
+def _run_and_announce(launch, message, target):
+    """
+    Call a pre-built launch callable and speak message if it succeeded.
+    launch() may fail by raising (Popen) or by returning a false value
+    (webbrowser.open). target is only used in the warning.
+    """
+    try:
+        ok = launch()
+    except Exception as e:
+        print(f"[WARN] Couldn't launch {target}: {e}")
+        return False
+    if not ok:
+        print(f"[WARN] Couldn't open {target}.")
+        return False
+    speak(message)
+    return True
+
+def compile_actions():
+    """
+    Fill ACTIONS from APP_MAPPING (call after resolve_mapped_programs()).
+    URLs and resolved programs get a callable with everything bound up front,
+    so triggering doesn't re-interpret the mapping or search for executables.
+    Other entries fall back to perform_and_announce().
+    """
+    ACTIONS.clear()
+    for finger_count, mapping in APP_MAPPING.items():
+        action, param = mapping
+        if action == "noop" or not param:
+            # nothing to do (e.g. open_program with no program set); no cooldown either
+            continue
+        if action == "open_url" and param:
+            launch = functools.partial(webbrowser.open, param)
+            ACTIONS[finger_count] = functools.partial(_run_and_announce, launch, "Opening website.", param)
+        elif action == "open_program" and finger_count in RESOLVED_CMDS:
+            launch = functools.partial(subprocess.Popen, RESOLVED_CMDS[finger_count],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_DETACHED)
+            ACTIONS[finger_count] = functools.partial(_run_and_announce, launch, "Opening program.",
+                                                      RESOLVED_CMDS[finger_count][0])
+        else:
+            ACTIONS[finger_count] = functools.partial(perform_and_announce, mapping)
+
 # ------------------------
 # Finger counting logic
 # ------------------------
 
+def _count_fingers_numpy(pts, is_right, out):
+    """
+    Finger state for N hands.
+    Input:
+        pts: float32 array (N, 21, 2) of normalized (x, y) landmarks
+        is_right: bool array (N,), handedness used for the thumb test
+        out: int8 array (N, 5), filled with 0/1 for [thumb, index, middle, ring, pinky]
+    Returns:
+        out
+    """
+    # Thumb: compare tip with IP (tip index 4, IP index 3)
+    # Logic depends on handedness because thumb extends sideways.
+    # This works for most camera setups when the frame is flipped for mirror view:
+    # right hand extended when tip_x < ip_x, left hand when tip_x > ip_x
+    sign = np.where(is_right, 1.0, -1.0)
+    out[:, 0] = sign * (pts[:, FINGER_TIPS[0], 0] - pts[:, FINGER_TIPS[0] - 1, 0]) < 0
+
+    # Other fingers: tip.y < pip.y means finger is up (y increases downward)
+    out[:, 1:] = pts[:, _FINGER_TIP_IDX, 1] < pts[:, _FINGER_PIP_IDX, 1]
+
+    return out
+
+if NUMBA_AVAILABLE:
+    _THUMB_TIP = FINGER_TIPS[0]
+    _OTHER_TIPS = tuple(FINGER_TIPS[1:])
+
+    @numba.njit(cache=True)
+    def _count_fingers_kernel(pts, is_right, out):
+        """Native equivalent of _count_fingers_numpy()."""
+        for h in range(pts.shape[0]):
+            tip_x = pts[h, _THUMB_TIP, 0]
+            ip_x = pts[h, _THUMB_TIP - 1, 0]
+            if is_right[h]:
+                out[h, 0] = 1 if tip_x < ip_x else 0
+            else:
+                out[h, 0] = 1 if tip_x > ip_x else 0
+            for i in range(4):
+                tip = _OTHER_TIPS[i]
+                out[h, i + 1] = 1 if pts[h, tip, 1] < pts[h, tip - 2, 1] else 0
+        return out
+else:
+    _count_fingers_kernel = _count_fingers_numpy
+
+# Scratch buffers for count_fingers_batched(), reused on every call (display thread only)
+_PTS_SCRATCH = np.empty((MAX_NUM_HANDS, NUM_LANDMARKS, 2), np.float32)
+_IS_RIGHT_SCRATCH = np.empty(MAX_NUM_HANDS, np.bool_)
+_FINGERS_SCRATCH = np.empty((MAX_NUM_HANDS, 5), np.int8)
+
+def count_fingers_batched(all_hand_landmarks, labels):
+    """
+    Finger counting for several hands in a single kernel call.
+    Input:
+        all_hand_landmarks: sequence of N lists of 21 mediapipe NormalizedLandmark
+        labels: sequence of N 'Left' / 'Right' / None (None is treated as 'Right')
+    Returns:
+        np.ndarray (N, 5) of 0/1 for [thumb, index, middle, ring, pinky] per hand.
+        Use .sum(axis=1) for the per-hand finger count. For N <= MAX_NUM_HANDS this
+        is a view of a buffer overwritten by the next call; .copy() it to keep it.
+    """
+    n = len(all_hand_landmarks)
+    if n <= MAX_NUM_HANDS:
+        pts, is_right, out = _PTS_SCRATCH[:n], _IS_RIGHT_SCRATCH[:n], _FINGERS_SCRATCH[:n]
+    else:
+        pts = np.empty((n, NUM_LANDMARKS, 2), np.float32)
+        is_right = np.empty(n, np.bool_)
+        out = np.empty((n, 5), np.int8)
+
+    for i, (h, label) in enumerate(zip(all_hand_landmarks, labels)):
+        pts[i] = [(lmpt.x, lmpt.y) for lmpt in h]
+        is_right[i] = label in (None, "Right")
+
+    return _count_fingers_kernel(pts, is_right, out)
+
+def warm_up_finger_counting():
+    """
+    Run the finger kernel once so numba compiles (or loads from its cache) at
+    startup rather than on the first detected hand. Uses the same scratch
+    buffers, so the compiled signature matches the one used per frame.
+    """
+    _PTS_SCRATCH.fill(0)
+    _IS_RIGHT_SCRATCH.fill(True)
+    _count_fingers_kernel(_PTS_SCRATCH[:1], _IS_RIGHT_SCRATCH[:1], _FINGERS_SCRATCH[:1])
+
 def count_fingers_from_landmarks(hand_landmarks, hand_label=None):
     """
+    Single-hand convenience wrapper around count_fingers_batched().
     Input:
-        hand_landmarks: mediapipe.landmark list (normalized coordinates)
-        hand_label: 'Left' or 'Right' (string) or None
+        hand_landmarks: list of 21 mediapipe NormalizedLandmark (normalized coordinates)
+        hand_label: 'Left' or 'Right' (string) or None (treated as 'Right')
     Returns:
         int: number of extended fingers (0-5)
         list: list of 0/1 for [thumb, index, middle, ring, pinky]
     """
-    # Convert landmarks to simpler list of (x,y)
-    lm = [(lmpt.x, lmpt.y) for lmpt in hand_landmarks.landmark]
+    fingers = count_fingers_batched([hand_landmarks], [hand_label])[0]
+    return int(fingers.sum()), fingers.tolist()
+
+# ------------------------
+# HUD
+# ------------------------
 
-    fingers = []
+HUD_HEIGHT = 30
+HUD_COOLDOWN_LABEL = "Cooldown: "
 
-    # Thumb: compare tip with IP (tip index 4, IP index 3)
-    # Logic depends on handedness because thumb extends sideways
+def _build_hud_template(width):
+    """
+    Pre-render the static part of the HUD (black top bar + cooldown label).
+    Returns (template, x) where x is where the cooldown value should be drawn.
+    """
+    template = np.zeros((HUD_HEIGHT, width, 3), np.uint8)
+    label_x = width - 200
+    cv2.putText(template, HUD_COOLDOWN_LABEL, (label_x, 20),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200,200,200), 1)
+    (label_w, _), _ = cv2.getTextSize(HUD_COOLDOWN_LABEL, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    return template, label_x + label_w
+
+def _draw_hand(frame, hand_landmarks):
+    """Draw one hand's landmarks and connections onto frame (in place)."""
+    height, width = frame.shape[:2]
+    pts = [(int(lm.x * width), int(lm.y * height)) for lm in hand_landmarks]
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(frame, pts[a], pts[b], (224,224,224), 2)
+    for pt in pts:
+        cv2.circle(frame, pt, 3, (0,0,255), -1)
+
+# ------------------------
+# Pipeline stages
+# ------------------------
+
+def _put_until_stopped(q, item, stop_event):
+    """
+    Block on q.put() with back-pressure, but give up once stop_event is set.
+    Returns True if the item was queued.
+    """
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=PIPELINE_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _read_latest(cap, drain):
+    """
+    Like cap.read(), but first grab() (without decoding) `drain - 1` frames
+    that piled up in the driver buffer, so only the newest one is decoded.
+    """
+    for _ in range(drain):
+        if not cap.grab():
+            return False, None
+    return cap.retrieve()
+
+def _capture_loop(cap, frame_q, stop_event, is_behind):
+    """
+    Thread A: read frames from the webcam, then downscale, mirror and convert
+    to RGB for inference.
+    Pushes (frame_bgr, small_rgb) onto frame_q. frame_bgr is NOT mirrored: only
+    the small inference copy is, and the display thread mirrors frame_bgr in
+    place on the frames it actually shows.
+
+    small_rgb is a fresh array per frame: detect_async() returns before MediaPipe
+    is done with the image, so it must not be a buffer this loop reuses.
+
+    When is_behind() reports that inference or display is lagging, stale
+    buffered frames are dropped before the next read. Some backends ignore
+    CAP_PROP_BUFFERSIZE.
+    """
     try:
-        tip_x = lm[FINGER_TIPS[0]][0]
-        ip_x = lm[FINGER_TIPS[0] - 1][0]
-        if hand_label is None:
-            # fallback: assume right
-            hand_label = "Right"
-        # This logic works for most camera setups when the frame is flipped for mirror view
-        if hand_label == "Right":
-            # for right hand, thumb extended when tip_x < ip_x
-            fingers.append(1 if tip_x < ip_x else 0)
-        else:
-            # for left hand, thumb extended when tip_x > ip_x
-            fingers.append(1 if tip_x > ip_x else 0)
-    except Exception:
-        fingers.append(0)
+        small = None  # sized from the first frame, since the driver may ignore CAPTURE_WIDTH/HEIGHT
+        # Unsupported backends (e.g. DSHOW/MSMF) report 0 or -1; always drain at least one stale frame
+        backlog = max(2, int(cap.get(cv2.CAP_PROP_BUFFERSIZE)))
+        while not stop_event.is_set():
+            ret, frame = _read_latest(cap, backlog if is_behind() else 1)
+            if not ret:
+                print("[ERROR] Failed reading frame from webcam.")
+                break
+
+            if small is None:
+                height, width = frame.shape[:2]
+                small_h = max(1, round(INFERENCE_WIDTH * height / width))
+                small = np.empty((small_h, INFERENCE_WIDTH, 3), np.uint8)
+            cv2.resize(frame, (INFERENCE_WIDTH, small.shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+            # Mirror view so it feels natural; landmarks come back in mirrored coordinates
+            cv2.flip(small, 1, dst=small)
+            small_rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            _put_until_stopped(frame_q, (frame, small_rgb), stop_event)
+    finally:
+        # Whatever ends this stage (error, exception or shutdown) stops the whole pipeline
+        stop_event.set()
+
+class _InferenceStage:
+    """
+    Thread B: feed captured frames to a LIVE_STREAM HandLandmarker and forward
+    its results (delivered asynchronously on MediaPipe's own thread) to result_q
+    as (frame_bgr, results).
+
+    Neither side blocks on the other: at most MAX_IN_FLIGHT frames are kept
+    waiting for a result, and when result_q is full the oldest result is
+    replaced by the newest, so a stalled display can't grow memory or stall
+    MediaPipe's callback thread.
+
+    The whole downscaled frame is always submitted. In LIVE_STREAM mode the
+    landmarker already searches around the previous frame's landmarks and only
+    re-runs palm detection when it loses the hand.
+    """
 
-    # Other fingers: tip.y < pip.y means finger is up (y increases downward)
-    for i in range(1, 5):
+    def __init__(self, result_q, stop_event):
+        self.result_q = result_q
+        self.stop_event = stop_event
+        self.landmarker = None
+        self._last_ts = -1
+        # timestamp_ms -> frame_bgr for frames MediaPipe hasn't answered yet
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def is_behind(self):
+        """True if MediaPipe or the display can't keep up with the camera."""
+        return len(self._pending) >= MAX_IN_FLIGHT or self.result_q.full()
+
+    def on_result(self, results, output_image, timestamp_ms):
+        """HandLandmarker result_callback."""
+        with self._lock:
+            frame = self._pending.pop(timestamp_ms, None)
+            # LIVE_STREAM drops frames when busy; forget any older ones
+            for ts in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[ts]
+        if frame is None:
+            return
         try:
-            tip_y = lm[FINGER_TIPS[i]][1]
-            pip_y = lm[FINGER_TIPS[i] - 2][1]  # pip joint is two indices before tip
-            fingers.append(1 if tip_y < pip_y else 0)
-        except Exception:
-            fingers.append(0)
+            self.result_q.put_nowait((frame, results))
+        except queue.Full:
+            # Display is behind: drop the oldest result in favour of this one
+            try:
+                self.result_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.result_q.put_nowait((frame, results))
+            except queue.Full:
+                pass
 
-    return sum(fingers), fingers
+    def run(self, frame_q):
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    frame, small_rgb = frame_q.get(timeout=PIPELINE_TIMEOUT)
+                except queue.Empty:
+                    continue
+
+                image = mp.Image(image_format=mp.ImageFormat.SRGB, data=small_rgb)
+
+                # detect_async() needs strictly increasing timestamps
+                ts = max(int(time.monotonic() * 1000), self._last_ts + 1)
+                self._last_ts = ts
+                with self._lock:
+                    while len(self._pending) >= MAX_IN_FLIGHT:
+                        del self._pending[min(self._pending)]
+                    self._pending[ts] = frame
+                self.landmarker.detect_async(image, ts)
+        finally:
+            # Whatever ends this stage (error, exception or shutdown) stops the whole pipeline
+            self.stop_event.set()
+
+def _create_landmarker(result_callback):
+    """
+    Build a LIVE_STREAM HandLandmarker. With USE_GPU, try the GPU delegate first
+    and fall back to the CPU one if it isn't supported on this platform.
+    """
+    delegates = [mp.tasks.BaseOptions.Delegate.CPU]
+    if USE_GPU:
+        delegates.insert(0, mp.tasks.BaseOptions.Delegate.GPU)
+
+    for delegate in delegates:
+        options = mp.tasks.vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=HAND_LANDMARKER_MODEL, delegate=delegate),
+            running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
+            num_hands=MAX_NUM_HANDS,
+            min_hand_detection_confidence=0.6,
+            min_hand_presence_confidence=0.6,
+            min_tracking_confidence=0.6,
+            result_callback=result_callback,
+        )
+        try:
+            return mp.tasks.vision.HandLandmarker.create_from_options(options)
+        except Exception as e:
+            if delegate == delegates[-1]:
+                raise
+            print(f"[WARN] GPU delegate unavailable, using CPU: {e}")
 
 # ------------------------
 # Main loop
 # ------------------------
 
+# cv2.pollKey() (OpenCV 4.5+) checks for a key press without pumping the GUI loop
+_poll_key = getattr(cv2, "pollKey", lambda: cv2.waitKey(1))
+
 def main():
     cap = cv2.VideoCapture(WEBCAM_INDEX)
     if not cap.isOpened():
         print("[ERROR] Could not open webcam. Check WEBCAM_INDEX or permissions.")
         return
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.6, min_tracking_confidence=0.6, max_num_hands=1)
-    mp_draw = mp.solutions.drawing_utils
+    # Not every backend honours these; failures are silently ignored by OpenCV
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, CAPTURE_BUFFER_SIZE)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
 
-    last_trigger_time = 0.0
+    resolve_mapped_programs()
+    compile_actions()
+    warm_up_finger_counting()
+
+    # capture -> inference -> display, connected by small bounded queues
+    frame_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    result_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop_event = threading.Event()
+    inference = _InferenceStage(result_q, stop_event)
+
+    try:
+        landmarker = _create_landmarker(inference.on_result)
+    except Exception as e:
+        print(f"[ERROR] Could not load hand landmarker model '{HAND_LANDMARKER_MODEL}': {e}")
+        cap.release()
+        return
+    inference.landmarker = landmarker
+
+    # Stability/cooldown state lives only in this (display) thread
+    last_trigger_time = time.perf_counter_ns() - COOLDOWN_NS  # no cooldown at startup
     stable_counter = 0
     last_count = None
 
-    print("[INFO] Starting gesture listener. Press 'q' to quit.")
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            print("[ERROR] Failed reading frame from webcam.")
-            break
+    # Built on the first frame, once the real capture width is known
+    hud_template = None
+    hud_value_x = 0
 
-        # Mirror the frame so it feels natural (mirror view)
-        frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(frame_rgb)
+    frame_idx = 0
 
-        display_text = "No hand"
+    # Launching a process can take a while (fork of a large process), keep it off this thread
+    action_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
-        if results.multi_hand_landmarks:
-            # hand landmarks and handness (Left/Right) are parallel lists. Use the first hand.
-            hand_landmarks = results.multi_hand_landmarks[0]
+    workers = [
+        threading.Thread(target=_capture_loop, args=(cap, frame_q, stop_event, inference.is_behind),
+                         daemon=True),
+        threading.Thread(target=inference.run, args=(frame_q,), daemon=True),
+    ]
+    for t in workers:
+        t.start()
 
-            # Get hand label
-            hand_label = None
-            if results.multi_handedness:
+    print("[INFO] Starting gesture listener. Press 'q' to quit.")
+    while not stop_event.is_set():
+        try:
+            frame, results = result_q.get(timeout=PIPELINE_TIMEOUT)
+        except queue.Empty:
+            # Keep the window responsive (and 'q' working) while no results arrive
+            if _poll_key() & 0xFF == ord('q'):
+                break
+            continue
+
+        # Gesture handling runs on every frame; drawing and showing only on every DISPLAY_EVERY-th
+        frame_idx += 1
+        show = frame_idx % DISPLAY_EVERY == 0
+        if show:
+            # Mirror the frame so it feels natural (mirror view)
+            cv2.flip(frame, 1, dst=frame)
+
+        display_text = "No hand"
+
+        if results.hand_landmarks:
+            # hand landmarks and handness (Left/Right) are parallel lists.
+            # Get hand labels
+            hand_labels = []
+            for i in range(len(results.hand_landmarks)):
                 try:
-                    hand_label = results.multi_handedness[0].classification[0].label
+                    hand_labels.append(results.handedness[i][0].category_name)
                 except Exception:
-                    hand_label = None
+                    hand_labels.append(None)
 
-            # Count fingers
-            finger_count, fingers_list = count_fingers_from_landmarks(hand_landmarks, hand_label)
+            # Count fingers for all hands at once; the first hand drives actions
+            fingers = count_fingers_batched(results.hand_landmarks, hand_labels)
+            finger_count = int(fingers[0].sum())
+            fingers_list = fingers[0].tolist()
+            hand_label = hand_labels[0]
             display_text = f"Fingers: {finger_count}  pattern: {fingers_list}  hand: {hand_label}"
 
             # Draw landmarks
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            if show:
+                for hand_landmarks in results.hand_landmarks:
+                    _draw_hand(frame, hand_landmarks)
 
             # Stability logic: require STABLE_FRAMES consecutive frames with same finger_count
             if finger_count == last_count:
@@ -294,45 +781,46 @@ def main():
                 last_count = finger_count
 
             # Trigger only if stable for required frames AND cooldown passed
-            now = time.time()
-            if stable_counter >= STABLE_FRAMES and (now - last_trigger_time) >= COOLDOWN_SECONDS:
-                # Perform mapped action
-                mapping = APP_MAPPING.get(finger_count, ("noop", None))
-                acted = perform_mapped_action(mapping)
-                if acted:
+            now = time.perf_counter_ns()
+            if stable_counter >= STABLE_FRAMES and (now - last_trigger_time) >= COOLDOWN_NS:
+                # Perform mapped action in the background; the cooldown starts now
+                action = ACTIONS.get(finger_count)
+                if action is not None:
+                    action_executor.submit(action)
                     last_trigger_time = now
-                    # Optional voice feedback
-                    if mapping[0] == "open_url":
-                        speak(f"Opening website.")
-                    elif mapping[0] == "open_program":
-                        speak(f"Opening program.")
-                    elif mapping[0] == "say_text":
-                        speak(mapping[1])
-                    else:
-                        # Generic
-                        speak("Action performed.")
 
         else:
             # No hand detected; reset stability but don't reset last_count so quick return works
             stable_counter = 0
             last_count = None
 
-        # HUD overlay
-        cv2.rectangle(frame, (0,0), (frame.shape[1], 30), (0,0,0), -1)  # top bar
-        cv2.putText(frame, display_text, (8,20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2)
+        if show:
+            # HUD overlay: copy the pre-rendered bar, then draw only the changing text
+            if hud_template is None or hud_template.shape[1] != frame.shape[1]:
+                hud_template, hud_value_x = _build_hud_template(frame.shape[1])
+            frame[0:HUD_HEIGHT] = hud_template
+            cv2.putText(frame, display_text, (8,20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2)
 
-        cooldown_remaining = max(0.0, COOLDOWN_SECONDS - (time.time() - last_trigger_time))
-        cv2.putText(frame, f"Cooldown: {cooldown_remaining:.1f}s", (frame.shape[1]-200, 20),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200,200,200), 1)
+            cooldown_remaining = max(0, COOLDOWN_NS - (time.perf_counter_ns() - last_trigger_time)) / 1e9
+            cv2.putText(frame, f"{cooldown_remaining:.1f}s", (hud_value_x, 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200,200,200), 1)
 
-        cv2.imshow("Gesture Launcher", frame)
-        key = cv2.waitKey(1) & 0xFF
+            cv2.imshow("Gesture Launcher", frame)
+            key = cv2.waitKey(1) & 0xFF
+        else:
+            # Cheap check for 'q' without a full GUI event-loop round-trip
+            key = _poll_key() & 0xFF
         if key == ord('q'):
             break
 
+    stop_event.set()
+    for t in workers:
+        t.join(timeout=1.0)
+
+    action_executor.shutdown(wait=False)
     cap.release()
     cv2.destroyAllWindows()
-    hands.close()
+    landmarker.close()
 
 if __name__ == "__main__":
     main()